@@ -0,0 +1,52 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""Ahead-of-time compiled uptime kernels.
+
+sum_uptime_periods mirrors main._sum_uptime_periods so deployments can
+avoid Numba's JIT warmup on the first report; uptime_minutes is the
+single-window variant used by main_simple. Build with:
+
+    python setup.py build_ext --inplace
+"""
+
+cpdef tuple sum_uptime_periods(long long[::1] ts_ns, unsigned char[::1] active,
+                               long long end_ns, long long hour_cut,
+                               long long day_cut, long long week_cut):
+    """Accumulate active-interval nanoseconds for the hour/day/week windows
+    in a single scan over the sorted timestamp array"""
+    cdef double up_hour = 0.0
+    cdef double up_day = 0.0
+    cdef double up_week = 0.0
+    cdef double duration
+    cdef long long next_ns
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n = ts_ns.shape[0]
+
+    for i in range(n):
+        if not active[i]:
+            continue
+        next_ns = ts_ns[i + 1] if i + 1 < n else end_ns
+        duration = next_ns - ts_ns[i]
+        if ts_ns[i] >= week_cut:
+            up_week += duration
+            if ts_ns[i] >= day_cut:
+                up_day += duration
+                if ts_ns[i] >= hour_cut:
+                    up_hour += duration
+    return up_hour, up_day, up_week
+
+
+cpdef double uptime_minutes(long long[::1] ts_us, unsigned char[::1] active,
+                            long long end_us):
+    """Sum the active intervals of a sorted microsecond timestamp array
+    (each record counts until the next one, the last until end_us) and
+    return the total in minutes"""
+    cdef double total = 0.0
+    cdef long long next_us
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n = ts_us.shape[0]
+
+    for i in range(n):
+        if active[i]:
+            next_us = ts_us[i + 1] if i + 1 < n else end_us
+            total += next_us - ts_us[i]
+    return total / 60e6
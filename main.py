@@ -1,18 +1,34 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
 from fastapi.responses import FileResponse
-from sqlalchemy import create_engine, Column, String, Integer, DateTime, Boolean, Text
+from sqlalchemy import create_engine, event, Column, String, Integer, DateTime, Boolean, Text, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
+import numpy as np
 import pandas as pd
-import pytz
 from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+import hashlib
+import threading
 import uuid
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from multiprocessing import shared_memory
 import tempfile
-import csv
 from typing import Dict, List
 import logging
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; fall back to NumPy
+    njit = None
+
+try:
+    import pyarrow.csv as pacsv
+except ImportError:  # PyArrow is optional; fall back to pandas' reader
+    pacsv = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -25,29 +41,45 @@ engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune SQLite for this workload: WAL lets the polling endpoints read
+    while the report writer commits, NORMAL sync avoids the per-commit
+    fsync stall, and a bigger page cache keeps the hot btrees in memory"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.close()
+
 # Database Models
 class StoreStatus(Base):
     __tablename__ = "store_status"
-    
-    id = Column(Integer, primary_key=True, index=True)
-    store_id = Column(String, index=True)
-    timestamp_utc = Column(DateTime)
+
+    # Natural composite key: one observation per store per timestamp. Rows
+    # are bulk-inserted pre-sorted so physical order matches key order and
+    # per-store scans are sequential reads.
+    store_id = Column(String, primary_key=True)
+    timestamp_utc = Column(DateTime, primary_key=True)
     status = Column(String)  # 'active' or 'inactive'
 
 class StoreHours(Base):
     __tablename__ = "store_hours"
-    
+
     id = Column(Integer, primary_key=True, index=True)
-    store_id = Column(String, index=True)
+    store_id = Column(String)
     day_of_week = Column(Integer)  # 0=Monday, 6=Sunday
-    start_time_local = Column(String)  # HH:MM format
-    end_time_local = Column(String)   # HH:MM format
+    start_min_local = Column(Integer)  # minute of day (0-1440), from HH:MM
+    end_min_local = Column(Integer)
+
+    __table_args__ = (Index('ix_hours_store_dow', 'store_id', 'day_of_week'),)
 
 class StoreTimezone(Base):
     __tablename__ = "store_timezone"
-    
-    id = Column(Integer, primary_key=True, index=True)
-    store_id = Column(String, index=True)
+
+    # store_id is the natural key; one timezone per store
+    store_id = Column(String, primary_key=True, index=True)
     timezone_str = Column(String)
 
 class Report(Base):
@@ -64,6 +96,31 @@ Base.metadata.create_all(bind=engine)
 # Global variable to store the max timestamp from store_status.csv
 MAX_TIMESTAMP = None
 
+# Content hash of store_status.csv; reports are cached under this key since
+# the inputs never change after startup
+DATA_CACHE_KEY = None
+REPORT_CACHE_DIR = "reports"
+
+def _file_sha1(path: str) -> str:
+    """Short content hash of a file, read in 1 MiB chunks"""
+    sha = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()[:12]
+
+# In-process report state, keyed by report_id. The polling endpoint reads
+# this dict instead of opening a SQL session per poll; the reports table
+# stays the durable record and is only written on state changes (and read
+# again only for cold-start recovery).
+REPORTS: Dict[str, dict] = {}
+_reports_lock = threading.Lock()
+
+def _set_report_state(report_id: str, status: str, csv_file_path: str = None):
+    """Update the in-process report state under the lock"""
+    with _reports_lock:
+        REPORTS[report_id] = {'status': status, 'csv_file_path': csv_file_path}
+
 def get_db():
     db = SessionLocal()
     try:
@@ -73,248 +130,413 @@ def get_db():
 
 def import_csv_data():
     """Import CSV data into the database"""
-    global MAX_TIMESTAMP
-    
-    db = SessionLocal()
+    global MAX_TIMESTAMP, DATA_CACHE_KEY
+
+    DATA_CACHE_KEY = _file_sha1('store_status.csv')
+
     try:
-        # Clear existing data
-        db.query(StoreStatus).delete()
-        db.query(StoreHours).delete()
-        db.query(StoreTimezone).delete()
-        
-        # Import store_status.csv
+        # Recreate the data tables rather than deleting rows: the schema has
+        # grown columns and indexes that create_all never adds to a
+        # pre-existing store_monitoring.db, and the import replaces every
+        # row anyway. Also shields against main_simple.py having written
+        # its diverging store_hours schema to the same file.
+        data_tables = [StoreStatus.__table__, StoreHours.__table__,
+                       StoreTimezone.__table__]
+        Base.metadata.drop_all(bind=engine, tables=data_tables)
+        Base.metadata.create_all(bind=engine, tables=data_tables)
+
+        # Import store_status.csv. PyArrow's reader parses the file with
+        # multiple threads; Arrow's strptime cannot handle the fractional
+        # seconds + ' UTC' suffix, so the timestamp column stays on pandas'
+        # vectorized C parser with an explicit format either way.
+        # Timestamps are normalized to naive UTC, matching how they are
+        # stored in (and read back from) SQLite.
         logger.info("Importing store_status.csv...")
-        store_status_df = pd.read_csv('store_status.csv')
-        store_status_df['timestamp_utc'] = pd.to_datetime(store_status_df['timestamp_utc'])
-        
+        if pacsv is not None:
+            store_status_df = pacsv.read_csv('store_status.csv').to_pandas()
+            store_status_df['timestamp_utc'] = pd.to_datetime(
+                store_status_df['timestamp_utc'], format='%Y-%m-%d %H:%M:%S.%f %Z', utc=True)
+        else:
+            store_status_df = pd.read_csv('store_status.csv', parse_dates=['timestamp_utc'],
+                                          date_format='%Y-%m-%d %H:%M:%S.%f %Z')
+        store_status_df['timestamp_utc'] = (
+            pd.to_datetime(store_status_df['timestamp_utc'], utc=True).dt.tz_localize(None))
+
         # Find max timestamp for current time simulation
         MAX_TIMESTAMP = store_status_df['timestamp_utc'].max()
         logger.info(f"Max timestamp found: {MAX_TIMESTAMP}")
-        
-        for _, row in store_status_df.iterrows():
-            store_status = StoreStatus(
-                store_id=row['store_id'],
-                timestamp_utc=row['timestamp_utc'],
-                status=row['status']
-            )
-            db.add(store_status)
-        
+
+        # Sort to match the (store_id, timestamp_utc) primary key and drop
+        # the duplicate observations that would violate it
+        store_status_df = store_status_df.drop_duplicates(['store_id', 'timestamp_utc'])
+        store_status_df = store_status_df.sort_values(['store_id', 'timestamp_utc'])
+
         # Import menu_hours.csv
         logger.info("Importing menu_hours.csv...")
         store_hours_df = pd.read_csv('menu_hours.csv')
-        for _, row in store_hours_df.iterrows():
-            store_hours = StoreHours(
-                store_id=row['store_id'],
-                day_of_week=row['dayOfWeek'],
-                start_time_local=row['start_time_local'],
-                end_time_local=row['end_time_local']
-            )
-            db.add(store_hours)
-        
-        # Import timezones.csv
+        store_hours_df = store_hours_df.rename(columns={'dayOfWeek': 'day_of_week'})
+
+        # Precompile the HH:MM strings to minute-of-day ints once here so no
+        # lookup ever re-parses them. Rows whose hours fail to parse are
+        # dropped, which the lookups treat as open 24/7 — the same per-row
+        # degradation the old per-record parser had.
+        minute_cols = ['start_min_local', 'end_min_local']
+        for source_col, minute_col in (('start_time_local', 'start_min_local'),
+                                       ('end_time_local', 'end_min_local')):
+            parts = store_hours_df[source_col].astype(str).str.extract(r'^(\d+):(\d+)')
+            store_hours_df[minute_col] = (pd.to_numeric(parts[0], errors='coerce') * 60
+                                          + pd.to_numeric(parts[1], errors='coerce'))
+        dropped = store_hours_df[minute_cols].isna().any(axis=1)
+        if dropped.any():
+            logger.warning(f"Skipping {int(dropped.sum())} menu_hours rows with "
+                           f"unparseable business hours")
+            store_hours_df = store_hours_df[~dropped]
+        store_hours_df = store_hours_df.drop(columns=['start_time_local', 'end_time_local'])
+        store_hours_df[minute_cols] = store_hours_df[minute_cols].astype(int)
+
+        # Import timezones.csv. The natural store_id primary key rejects
+        # duplicated rows, so keep the first occurrence — matching what the
+        # old .first() lookup returned
         logger.info("Importing timezones.csv...")
         timezones_df = pd.read_csv('timezones.csv')
-        for _, row in timezones_df.iterrows():
-            store_timezone = StoreTimezone(
-                store_id=row['store_id'],
-                timezone_str=row['timezone_str']
-            )
-            db.add(store_timezone)
-        
-        db.commit()
+        timezones_df = timezones_df.drop_duplicates('store_id')
+
+        # Bulk insert all three tables inside a single transaction so
+        # SQLAlchemy emits multi-row INSERTs (no per-row ORM bookkeeping)
+        # and only one commit hits the disk
+        with engine.begin() as conn:
+            store_status_df.to_sql('store_status', conn, if_exists='append',
+                                   index=False, chunksize=10_000, method='multi')
+            store_hours_df.to_sql('store_hours', conn, if_exists='append',
+                                  index=False, chunksize=5_000, method='multi')
+            timezones_df.to_sql('store_timezone', conn, if_exists='append',
+                                index=False, chunksize=10_000, method='multi')
         logger.info("Data import completed successfully")
         
     except Exception as e:
         logger.error(f"Error importing data: {e}")
-        db.rollback()
         raise
-    finally:
-        db.close()
 
-def is_store_open(store_id: str, timestamp_utc: datetime, db) -> bool:
-    """Check if a store is open at a given UTC timestamp"""
+def load_timezones(db) -> Dict[str, str]:
+    """Load all store timezones into a dict keyed by store_id"""
+    return dict(db.query(StoreTimezone.store_id, StoreTimezone.timezone_str).all())
+
+def load_business_hours(db) -> Dict[str, dict]:
+    """Load all business hours into a dict keyed by store_id, then day_of_week;
+    values are (start, end) minute-of-day ints"""
+    hours_by_store = {}
+    for record in db.query(StoreHours).all():
+        hours_by_store.setdefault(record.store_id, {})[record.day_of_week] = (
+            record.start_min_local, record.end_min_local)
+    return hours_by_store
+
+def _sum_uptime_periods(ts_ns: np.ndarray, active: np.ndarray, end_ns: int,
+                        hour_cut: int, day_cut: int, week_cut: int) -> tuple:
+    """Accumulate active-interval nanoseconds for all three report windows
+    in a single scan.
+
+    Observations at or after each cutoff (which form a suffix of the sorted
+    array) contribute to that window; each active observation counts until
+    the next observation or end_ns.
+    """
+    up_hour = up_day = up_week = 0.0
+    n = len(ts_ns)
+    for i in range(n):
+        if not active[i]:
+            continue
+        next_ns = ts_ns[i + 1] if i + 1 < n else end_ns
+        duration = next_ns - ts_ns[i]
+        if ts_ns[i] >= week_cut:
+            up_week += duration
+            if ts_ns[i] >= day_cut:
+                up_day += duration
+                if ts_ns[i] >= hour_cut:
+                    up_hour += duration
+    return up_hour, up_day, up_week
+
+if njit is not None:
+    # JIT-compile the tight scalar loop; cache=True amortizes compilation
+    _sum_uptime_periods = njit(cache=True)(_sum_uptime_periods)
+
+try:
+    # Prefer the AOT-compiled kernel when it has been built (see setup.py):
+    # same native speed as the Numba path but no JIT warmup on the first
+    # report after startup
+    from _uptime import sum_uptime_periods as _compiled_sum_uptime_periods
+
+    def _sum_uptime_periods(ts_ns, active, end_ns, hour_cut, day_cut, week_cut):  # noqa: F811
+        return _compiled_sum_uptime_periods(ts_ns, active.view(np.uint8), end_ns,
+                                            hour_cut, day_cut, week_cut)
+except ImportError:
+    pass
+
+def business_minutes_per_weekday(store_hours: dict) -> np.ndarray:
+    """Business minutes for each weekday (0=Monday, 6=Sunday); days without
+    configured hours count the full 24/7 day"""
+    minutes = np.full(7, 24 * 60, dtype=np.int64)
+    for day_of_week, (start, end) in store_hours.items():
+        # Overnight hours (e.g., 22:00 to 06:00) wrap past midnight
+        minutes[day_of_week] = (24 * 60 - start + end) if start > end else (end - start)
+    return minutes
+
+@lru_cache(maxsize=None)
+def _tz(timezone_str: str) -> ZoneInfo:
+    """Memoized timezone lookup; construction does tz-database file I/O so
+    it is too expensive to repeat once per store"""
+    return ZoneInfo(timezone_str)
+
+def business_hours_mask(timestamps, timezone_str: str, store_hours: dict) -> np.ndarray:
+    """Vectorized is_store_open: boolean mask of which UTC timestamps fall
+    inside the store's local business hours"""
     try:
-        # Get store timezone (default to America/Chicago if missing)
-        timezone_record = db.query(StoreTimezone).filter(StoreTimezone.store_id == store_id).first()
-        timezone_str = timezone_record.timezone_str if timezone_record else "America/Chicago"
-        
-        # Convert UTC to local time
-        local_tz = pytz.timezone(timezone_str)
-        local_time = timestamp_utc.replace(tzinfo=pytz.UTC).astimezone(local_tz)
-        
-        # Get day of week (0=Monday, 6=Sunday)
-        day_of_week = local_time.weekday()
-        
-        # Check if store has specific hours for this day
-        hours_record = db.query(StoreHours).filter(
-            StoreHours.store_id == store_id,
-            StoreHours.day_of_week == day_of_week
-        ).first()
-        
-        # If no hours specified, store is open 24/7
-        if not hours_record:
-            return True
-        
-        # Parse business hours
-        start_time = datetime.strptime(hours_record.start_time_local, "%H:%M").time()
-        end_time = datetime.strptime(hours_record.end_time_local, "%H:%M").time()
-        current_time = local_time.time()
-        
-        # Handle overnight hours (e.g., 22:00 to 06:00)
-        if start_time > end_time:
-            return current_time >= start_time or current_time <= end_time
-        else:
-            return start_time <= current_time <= end_time
-            
+        # Convert all timestamps to local time in one pass
+        ts = pd.DatetimeIndex(timestamps)
+        if ts.tz is None:
+            ts = ts.tz_localize('UTC')
+        local = ts.tz_convert(_tz(timezone_str))
+
+        # Day of week (0=Monday, 6=Sunday) and minute-of-day arrays. Keep
+        # the sub-minute fraction so boundary records (e.g. 21:00:30 with a
+        # 21:00 close) classify exactly like the scalar time comparison
+        dow = local.weekday.to_numpy()
+        mins = (local.hour * 60 + local.minute
+                + (local.second + local.microsecond / 1e6) / 60.0).to_numpy()
+
+        # Per-day open/close minutes; days without hours are open 24/7
+        start_min = np.zeros(7, dtype=np.int64)
+        end_min = np.full(7, 24 * 60, dtype=np.int64)
+        for day_of_week, (start, end) in store_hours.items():
+            start_min[day_of_week] = start
+            end_min[day_of_week] = end
+
+        # Handle overnight hours (e.g., 22:00 to 06:00) with the OR branch
+        starts = start_min[dow]
+        ends = end_min[dow]
+        return np.where(starts <= ends,
+                        (mins >= starts) & (mins <= ends),
+                        (mins >= starts) | (mins <= ends))
+
     except Exception as e:
         logger.error(f"Error checking store hours: {e}")
-        return True  # Default to open if error
+        return np.ones(len(timestamps), dtype=bool)  # Default to open if error
 
-def calculate_uptime_downtime(store_id: str, db, time_period: str) -> tuple:
-    """Calculate uptime and downtime for a store within business hours"""
+def _total_business_minutes(minutes_per_dow: np.ndarray, start_time: datetime,
+                            current_time: datetime) -> int:
+    """Total business minutes in [start_time, current_time] from the
+    per-weekday minutes and a weekday histogram of the period's days —
+    O(1) per period instead of a day-by-day loop"""
+    start_date = start_time.date()
+    end_date = current_time.date()
+    n_days = (end_date - start_date).days + 1
+    full_weeks, remainder = divmod(n_days, 7)
+    day_counts = np.full(7, full_weeks, dtype=np.int64)
+    day_counts[(start_date.weekday() + np.arange(remainder)) % 7] += 1
+    return int((minutes_per_dow * day_counts).sum())
+
+def calculate_all_periods(ts_ns: np.ndarray, active: np.ndarray, timezone_str: str,
+                          store_hours: dict, current_time: datetime) -> tuple:
+    """Calculate (uptime, downtime) for the last hour, day and week within
+    business hours, in one scan over the store's observations.
+
+    ts_ns is the store's sorted observation timestamps as int64 UTC
+    nanoseconds with active the matching boolean status array; timezone_str
+    and store_hours come from the preloaded lookups. Hour values are
+    minutes; day and week values are hours.
+    """
     try:
-        # Get all status records for the store
-        status_records = db.query(StoreStatus).filter(
-            StoreStatus.store_id == store_id
-        ).order_by(StoreStatus.timestamp_utc).all()
-        
-        if not status_records:
-            return 0, 0
-        
-        # Filter records within business hours
-        business_hours_records = []
-        for record in status_records:
-            if is_store_open(store_id, record.timestamp_utc, db):
-                business_hours_records.append(record)
-        
-        if not business_hours_records:
-            return 0, 0
-        
-        # Calculate time intervals based on period
-        current_time = MAX_TIMESTAMP
-        if time_period == "hour":
-            start_time = current_time - timedelta(hours=1)
-        elif time_period == "day":
-            start_time = current_time - timedelta(days=1)
-        elif time_period == "week":
-            start_time = current_time - timedelta(weeks=1)
-        else:
-            return 0, 0
-        
-        # Filter records within time period
-        period_records = [r for r in business_hours_records if r.timestamp_utc >= start_time]
-        
-        if not period_records:
-            return 0, 0
-        
-        # Calculate total business hours in the period
-        total_business_minutes = 0
-        uptime_minutes = 0
-        
-        # For each day in the period, calculate business hours
-        current_date = start_time.date()
-        end_date = current_time.date()
-        
-        while current_date <= end_date:
-            # Get business hours for this day
-            day_of_week = current_date.weekday()
-            hours_record = db.query(StoreHours).filter(
-                StoreHours.store_id == store_id,
-                StoreHours.day_of_week == day_of_week
-            ).first()
-            
-            if hours_record:
-                start_time_local = datetime.strptime(hours_record.start_time_local, "%H:%M").time()
-                end_time_local = datetime.strptime(hours_record.end_time_local, "%H:%M").time()
-                
-                # Calculate business minutes for this day
-                if start_time_local > end_time_local:  # Overnight hours
-                    day_minutes = (24 * 60 - start_time_local.hour * 60 - start_time_local.minute + 
-                                 end_time_local.hour * 60 + end_time_local.minute)
-                else:
-                    day_minutes = (end_time_local.hour * 60 + end_time_local.minute - 
-                                 start_time_local.hour * 60 - start_time_local.minute)
-                
-                total_business_minutes += day_minutes
+        if len(ts_ns) == 0:
+            return 0, 0, 0, 0, 0, 0
+
+        # Filter records within business hours (one vectorized pass)
+        open_mask = business_hours_mask(pd.DatetimeIndex(ts_ns.view('datetime64[ns]')),
+                                        timezone_str, store_hours)
+        ts_ns = ts_ns[open_mask]
+        active = active[open_mask]
+
+        if len(ts_ns) == 0:
+            return 0, 0, 0, 0, 0, 0
+
+        end_ns = pd.Timestamp(current_time).value
+
+        # One pass accumulates uptime for all three windows instead of
+        # re-scanning the array per period
+        period_starts = {
+            'hour': current_time - timedelta(hours=1),
+            'day': current_time - timedelta(days=1),
+            'week': current_time - timedelta(weeks=1),
+        }
+        cuts = {p: pd.Timestamp(t).value for p, t in period_starts.items()}
+        up_hour_ns, up_day_ns, up_week_ns = _sum_uptime_periods(
+            ts_ns, active, end_ns, cuts['hour'], cuts['day'], cuts['week'])
+        uptime = {'hour': up_hour_ns / 60e9, 'day': up_day_ns / 60e9, 'week': up_week_ns / 60e9}
+
+        minutes_per_dow = business_minutes_per_weekday(store_hours)
+        results = []
+        for period in ('hour', 'day', 'week'):
+            # Periods with no observations report 0/0, matching the old
+            # per-period early return
+            if ts_ns[-1] < cuts[period]:
+                results.append((0, 0))
+                continue
+            total_minutes = _total_business_minutes(
+                minutes_per_dow, period_starts[period], current_time)
+            uptime_minutes = uptime[period]
+            downtime_minutes = total_minutes - uptime_minutes
+            if period == 'hour':
+                results.append((uptime_minutes, downtime_minutes))
             else:
-                # 24/7 store
-                total_business_minutes += 24 * 60
-            
-            current_date += timedelta(days=1)
-        
-        # Calculate uptime based on observations
-        for i, record in enumerate(period_records):
-            if record.status == 'active':
-                # Calculate time until next observation or end of period
-                if i < len(period_records) - 1:
-                    next_time = period_records[i + 1].timestamp_utc
-                else:
-                    next_time = current_time
-                
-                # Calculate minutes between observations
-                time_diff = (next_time - record.timestamp_utc).total_seconds() / 60
-                uptime_minutes += time_diff
-        
-        downtime_minutes = total_business_minutes - uptime_minutes
-        
-        # Convert to appropriate units
-        if time_period == "hour":
-            return uptime_minutes, downtime_minutes
-        else:
-            return uptime_minutes / 60, downtime_minutes / 60  # Convert to hours
-            
+                results.append((uptime_minutes / 60, downtime_minutes / 60))  # Convert to hours
+        return (*results[0], *results[1], *results[2])
+
     except Exception as e:
         logger.error(f"Error calculating uptime/downtime: {e}")
-        return 0, 0
+        return 0, 0, 0, 0, 0, 0
+
+def compute_store_row(store_id: str, ts_ns: np.ndarray, active: np.ndarray,
+                      timezone_str: str, store_hours: dict, current_time: datetime) -> dict:
+    """Compute one report row for a store; pure function over plain arrays
+    so it can run in a worker process with no DB access"""
+    (uptime_hour, downtime_hour, uptime_day, downtime_day,
+     uptime_week, downtime_week) = calculate_all_periods(
+        ts_ns, active, timezone_str, store_hours, current_time)
+
+    # Rounding happens once, vectorized, on the assembled report columns
+    return {
+        'store_id': store_id,
+        'uptime_last_hour': uptime_hour,
+        'uptime_last_day': uptime_day,
+        'uptime_last_week': uptime_week,
+        'downtime_last_hour': downtime_hour,
+        'downtime_last_day': downtime_day,
+        'downtime_last_week': downtime_week
+    }
+
+# Set per worker process by _attach_shared_arrays; holds the shared-memory
+# blocks and the array views over them
+_shared_status_arrays = None
+
+def _attach_shared_arrays(ts_shm_name: str, active_shm_name: str, n_rows: int):
+    """ProcessPool initializer: re-attach the status arrays published by the
+    parent through shared memory, so tasks carry only index ranges"""
+    global _shared_status_arrays
+    ts_shm = shared_memory.SharedMemory(name=ts_shm_name)
+    active_shm = shared_memory.SharedMemory(name=active_shm_name)
+    ts_ns = np.ndarray((n_rows,), dtype=np.int64, buffer=ts_shm.buf)
+    active = np.ndarray((n_rows,), dtype=bool, buffer=active_shm.buf)
+    _shared_status_arrays = (ts_shm, active_shm, ts_ns, active)
+
+def compute_store_row_shared(store_id: str, start: int, stop: int, timezone_str: str,
+                             store_hours: dict, current_time: datetime) -> dict:
+    """Worker-side wrapper: slice the shared status arrays for one store and
+    compute its report row"""
+    _, _, ts_ns, active = _shared_status_arrays
+    return compute_store_row(store_id, ts_ns[start:stop], active[start:stop],
+                             timezone_str, store_hours, current_time)
 
 def generate_report(report_id: str):
     """Generate the store monitoring report"""
     try:
         db = SessionLocal()
-        
-        # Get all unique store IDs
-        store_ids = db.query(StoreStatus.store_id).distinct().all()
-        store_ids = [store_id[0] for store_id in store_ids]
-        
-        # Generate report data
+
+        # The input CSVs never change after startup, so a report computed
+        # for the current data hash can be served straight from the cache
+        parquet_path = os.path.join(REPORT_CACHE_DIR, f"{DATA_CACHE_KEY}.parquet")
+        csv_file_path = os.path.join(REPORT_CACHE_DIR, f"{DATA_CACHE_KEY}.csv")
+        if DATA_CACHE_KEY and pacsv is not None and os.path.exists(parquet_path):
+            if not os.path.exists(csv_file_path):
+                pd.read_parquet(parquet_path).to_csv(csv_file_path, index=False)
+            report = db.query(Report).filter(Report.id == report_id).first()
+            if report:
+                report.status = "Complete"
+                report.csv_file_path = csv_file_path
+                db.commit()
+            _set_report_state(report_id, "Complete", csv_file_path)
+            logger.info(f"Report {report_id} served from cache")
+            return
+
+        # Preload all three tables once so the per-store work below runs
+        # entirely in memory (no per-record SQL round-trips)
+        tz_by_store = load_timezones(db)
+        hours_by_store = load_business_hours(db)
+        status_df = pd.read_sql(
+            "SELECT store_id, timestamp_utc, status FROM store_status "
+            "ORDER BY store_id, timestamp_utc",
+            engine, parse_dates=['timestamp_utc'])
+
+        # Columnar (SoA) view of the whole dataset: one int64 timestamp
+        # array and one boolean status array, sliced per store. The ORDER BY
+        # makes each store's rows a contiguous index range.
+        ts_ns_all = status_df['timestamp_utc'].values.astype('datetime64[ns]').view('int64')
+        active_all = (status_df['status'] == 'active').to_numpy()
+
+        # Fan the independent per-store computations out across cores; only
+        # the main process touches the DB, and the status arrays travel to
+        # the workers once through shared memory so tasks carry only
+        # (start, stop) index ranges instead of pickled array copies
+        store_ids = []
+        starts = []
+        stops = []
+        timezone_strs = []
+        hours_list = []
+        for store_id, indices in status_df.groupby('store_id', sort=False).indices.items():
+            store_ids.append(store_id)
+            starts.append(int(indices[0]))
+            stops.append(int(indices[-1]) + 1)
+            timezone_strs.append(tz_by_store.get(store_id, "America/Chicago"))
+            hours_list.append(hours_by_store.get(store_id, {}))
+
         report_data = []
-        for store_id in store_ids:
-            # Calculate uptime and downtime for different periods
-            uptime_hour, downtime_hour = calculate_uptime_downtime(store_id, db, "hour")
-            uptime_day, downtime_day = calculate_uptime_downtime(store_id, db, "day")
-            uptime_week, downtime_week = calculate_uptime_downtime(store_id, db, "week")
-            
-            report_data.append({
-                'store_id': store_id,
-                'uptime_last_hour': round(uptime_hour, 2),
-                'uptime_last_day': round(uptime_day, 2),
-                'uptime_last_week': round(uptime_week, 2),
-                'downtime_last_hour': round(downtime_hour, 2),
-                'downtime_last_day': round(downtime_day, 2),
-                'downtime_last_week': round(downtime_week, 2)
-            })
-        
-        # Create CSV file
-        csv_file_path = f"report_{report_id}.csv"
-        with open(csv_file_path, 'w', newline='') as csvfile:
-            fieldnames = ['store_id', 'uptime_last_hour', 'uptime_last_day', 'uptime_last_week',
-                         'downtime_last_hour', 'downtime_last_day', 'downtime_last_week']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(report_data)
-        
+        if store_ids:
+            ts_shm = shared_memory.SharedMemory(create=True, size=ts_ns_all.nbytes)
+            active_shm = shared_memory.SharedMemory(create=True, size=active_all.nbytes)
+            try:
+                np.ndarray(ts_ns_all.shape, dtype=np.int64, buffer=ts_shm.buf)[:] = ts_ns_all
+                np.ndarray(active_all.shape, dtype=bool, buffer=active_shm.buf)[:] = active_all
+
+                with ProcessPoolExecutor(
+                        max_workers=os.cpu_count(),
+                        initializer=_attach_shared_arrays,
+                        initargs=(ts_shm.name, active_shm.name, len(ts_ns_all))) as executor:
+                    report_data = list(executor.map(
+                        compute_store_row_shared, store_ids, starts, stops,
+                        timezone_strs, hours_list, repeat(MAX_TIMESTAMP), chunksize=64))
+            finally:
+                ts_shm.close()
+                active_shm.close()
+                ts_shm.unlink()
+                active_shm.unlink()
+
+        # Create CSV file via pandas' C writer (no per-row dict handling),
+        # and persist the result as Parquet keyed by the data hash so later
+        # trigger calls skip the recomputation
+        fieldnames = ['store_id', 'uptime_last_hour', 'uptime_last_day', 'uptime_last_week',
+                      'downtime_last_hour', 'downtime_last_day', 'downtime_last_week']
+        report_df = pd.DataFrame(report_data, columns=fieldnames)
+        numeric_columns = fieldnames[1:]
+        report_df[numeric_columns] = np.round(report_df[numeric_columns], 2)
+        # Parquet (and hence the report cache) needs pyarrow; without it
+        # fall through to a plain per-report CSV
+        if DATA_CACHE_KEY and pacsv is not None:
+            os.makedirs(REPORT_CACHE_DIR, exist_ok=True)
+            report_df.to_parquet(parquet_path)
+        else:
+            csv_file_path = f"report_{report_id}.csv"
+        report_df.to_csv(csv_file_path, index=False)
+
         # Update report status
         report = db.query(Report).filter(Report.id == report_id).first()
         if report:
             report.status = "Complete"
             report.csv_file_path = csv_file_path
             db.commit()
-        
+        _set_report_state(report_id, "Complete", csv_file_path)
+
         logger.info(f"Report {report_id} generated successfully")
-        
+
     except Exception as e:
         logger.error(f"Error generating report: {e}")
         # Update report status to failed
+        _set_report_state(report_id, "Failed")
         try:
             report = db.query(Report).filter(Report.id == report_id).first()
             if report:
@@ -332,18 +554,17 @@ async def startup_event():
     import_csv_data()
 
 @app.post("/trigger_report")
-async def trigger_report(background_tasks: BackgroundTasks):
+async def trigger_report(background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """Trigger report generation"""
     try:
         report_id = str(uuid.uuid4())
-        
+
         # Create report record
-        db = SessionLocal()
         report = Report(id=report_id, status="Running")
         db.add(report)
         db.commit()
-        db.close()
-        
+        _set_report_state(report_id, "Running")
+
         # Start report generation in background
         background_tasks.add_task(generate_report, report_id)
         
@@ -354,28 +575,34 @@ async def trigger_report(background_tasks: BackgroundTasks):
         raise HTTPException(status_code=500, detail="Failed to trigger report")
 
 @app.get("/get_report/{report_id}")
-async def get_report(report_id: str):
+async def get_report(report_id: str, db: Session = Depends(get_db)):
     """Get report status or download CSV"""
     try:
-        db = SessionLocal()
-        report = db.query(Report).filter(Report.id == report_id).first()
-        db.close()
-        
-        if not report:
-            raise HTTPException(status_code=404, detail="Report not found")
-        
-        if report.status == "Running":
+        # Hot path: in-process state, no SQL. Fall back to the durable
+        # reports table only when this process hasn't seen the id
+        # (cold-start recovery after a restart).
+        with _reports_lock:
+            state = REPORTS.get(report_id)
+        if state is None:
+            report = db.query(Report).filter(Report.id == report_id).first()
+            if not report:
+                raise HTTPException(status_code=404, detail="Report not found")
+            state = {'status': report.status, 'csv_file_path': report.csv_file_path}
+            _set_report_state(report_id, state['status'], state['csv_file_path'])
+
+        if state['status'] == "Running":
             return {"status": "Running"}
-        elif report.status == "Complete":
-            if report.csv_file_path and os.path.exists(report.csv_file_path):
+        elif state['status'] == "Complete":
+            csv_file_path = state['csv_file_path']
+            if csv_file_path and os.path.exists(csv_file_path):
                 return FileResponse(
-                    report.csv_file_path,
+                    csv_file_path,
                     media_type="text/csv",
                     filename=f"store_report_{report_id}.csv"
                 )
             else:
                 raise HTTPException(status_code=500, detail="Report file not found")
-        elif report.status == "Failed":
+        elif state['status'] == "Failed":
             return {"status": "Failed", "message": "Report generation failed"}
         else:
             return {"status": "Unknown"}
@@ -0,0 +1,16 @@
+"""Optional build script for the compiled uptime kernels.
+
+    python setup.py build_ext --inplace
+
+main.py falls back to the Numba-JIT kernel and main_simple.py to its
+NumPy path when the extension has not been built, so this step is never
+required to run the service.
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="store-monitoring-kernels",
+    ext_modules=cythonize("_uptime.pyx", language_level=3),
+)